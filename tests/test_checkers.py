@@ -0,0 +1,30 @@
+import unittest
+
+from xeplint import checkers
+
+
+class TestLooksMultiRoot(unittest.TestCase):
+    def test_cases(self):
+        cases = [
+            ("", False),
+            ("not xml at all", False),
+            ("text <a/><b/>", False),
+            ("<a/>", False),
+            ("<a/><b/>", True),
+            ("\n<a>\n  <b>x</b>\n</a>\n<c/>\n", True),
+            ("<iq><query/><query/></iq>", False),
+            ("<a><b><c/></b></a>", False),
+            ("<a/><!-- <b/> -->", False),
+            ("<!-- <a/> --><b/>", False),
+            ("<a><![CDATA[</a><b>]]></a>", False),
+            ("<a/><![CDATA[<b/>]]>", False),
+            ("<?xml version='1.0'?><a/>", False),
+            ("<?pi <x/> ?><a/>", False),
+            ("<iq to='a/>b'><query/></iq>", False),
+            ("<iq to=\"a>b\"><query/></iq>", False),
+            ("<a x='/>'/><b y=\">\"/>", True),
+        ]
+
+        for code, expected in cases:
+            with self.subTest(code=code):
+                self.assertEqual(checkers._looks_multi_root(code), expected)
@@ -1,5 +1,6 @@
 import abc
 import functools
+import re
 
 import lxml.etree
 
@@ -25,6 +26,44 @@ MESSAGE_TYPE_MISSING_ANCHOR = messages.registry.register(
 )
 
 
+_SECTION_TAGS = context.SECTION_TAGS
+
+# start and end tags, with quoted attribute values (which may contain ">" or
+# "/>") skipped as a whole; comments, CDATA sections, processing instructions
+# and declarations are matched as well, but without the groups being set
+_MARKUP_RE = re.compile(
+    r"<!--.*?-->|<!\[CDATA\[.*?\]\]>|<[?!].*?>"
+    r"""|<(/?)(?:[^>"']|"[^"]*"|'[^']*')*?(/?)>""",
+    re.DOTALL,
+)
+
+
+def _looks_multi_root(code: str) -> bool:
+    if not code or not code.lstrip().startswith("<"):
+        return False
+
+    depth = 0
+    roots = 0
+    for match in _MARKUP_RE.finditer(code):
+        closing, empty = match.groups()
+        if closing is None:
+            continue
+
+        if closing:
+            depth -= 1
+            continue
+
+        if depth == 0:
+            roots += 1
+            if roots > 1:
+                return True
+
+        if not empty:
+            depth += 1
+
+    return False
+
+
 class AbstractChecker(metaclass=abc.ABCMeta):
     def __init__(self, ctx: context.XeplintContext):
         super().__init__()
@@ -45,12 +84,12 @@ def checker(f):
 
 @checker
 def check_anchors(context: context.XeplintContext):
-    sections = context.tree.xpath(" | ".join([
-        "//section{}".format(i)
-        for i in range(1, 7)
-    ]))
+    sections = context.iter_elements(*_SECTION_TAGS)
 
     existing_anchors = {}
+    # the "first used here" message is the same for all duplicates of an
+    # anchor, so it is only created once and shared between the records
+    first_seen_msgs = {}
 
     for section in sections:
         anchor = section.get("anchor")
@@ -65,10 +104,8 @@ def check_anchors(context: context.XeplintContext):
             )
             continue
 
-        try:
-            existing = existing_anchors[anchor]
-        except KeyError:
-            existing_anchors[anchor] = section
+        existing = existing_anchors.setdefault(anchor, section)
+        if existing is section:
             continue
 
         rec = context.messages.record(
@@ -78,6 +115,11 @@ def check_anchors(context: context.XeplintContext):
             (anchor,),
         )
 
+        first_seen_msg = first_seen_msgs.get(anchor)
+        if first_seen_msg is not None:
+            rec.related.append(first_seen_msg)
+            continue
+
         context.messages.record(
             MESSAGE_TYPE_DUPLICATE_ANCHOR,
             messages.Location(context.filename, existing.sourceline, None),
@@ -85,26 +127,50 @@ def check_anchors(context: context.XeplintContext):
             (anchor,),
             attach_to=rec,
         )
+        first_seen_msgs[anchor] = rec.related[-1]
+
+
+@checker
+def check_schemas(context: context.XeplintContext):
+    # schemas are compiled on first access, which records any problems with
+    # them
+    context.schemas
 
 
 class CheckExamples(AbstractChecker):
+    def __init__(self, ctx: context.XeplintContext):
+        super().__init__(ctx)
+        self._parser = lxml.etree.XMLParser(
+            collect_ids=False,
+            resolve_entities=False,
+            huge_tree=False,
+        )
+
     def _parse_example(self,
                        code: str,
                        message_sink: messages.MessageHandler):
+        if _looks_multi_root(code):
+            # multiple stanzas in one example, wrap them right away instead
+            # of finding out the hard way
+            code = "<document>" + code + "</document>"
+
         try:
-            return lxml.etree.fromstring(code).getroottree()
-        except lxml.etree.XMLSyntaxError as exc:
-            error_log = exc.error_log
+            return lxml.etree.fromstring(code, self._parser).getroottree()
+        except lxml.etree.XMLSyntaxError:
+            # the parser's log only holds the errors of its last run, unlike
+            # the exception's, which is the (thread-)global log
+            error_log = self._parser.error_log
             # type 5 is "extra content after end of document"
             if any(entry.type == 5 for entry in error_log):
-                # this situation is likely multiple stanzas in one example,
-                # wrap it and try again
+                # this situation is likely multiple stanzas in one example
+                # which were not detected up front, wrap it and try again
                 code = "<document>" + code + "</document>"
-                lxml.etree.clear_error_log()
                 try:
-                    return lxml.etree.fromstring(code).getroottree()
-                except lxml.etree.XMLSyntaxError as new_exc:
-                    error_log = new_exc.error_log
+                    return lxml.etree.fromstring(
+                        code, self._parser,
+                    ).getroottree()
+                except lxml.etree.XMLSyntaxError:
+                    error_log = self._parser.error_log
 
             elif error_log.last_error.type == 4:
                 # does not look like XML at all, ignore ...
@@ -131,9 +197,8 @@ class CheckExamples(AbstractChecker):
         pass
 
     def check(self):
-        examples = self._context.tree.xpath("//example")
+        examples = self._context.iter_elements("example")
         for example in examples:
-            lxml.etree.clear_error_log()
             with self._context.messages.context(
                     line_offset=example.sourceline - 1,
                     override_filename=self._context.filename) as message_sink:
@@ -148,6 +213,7 @@ class CheckExamples(AbstractChecker):
 
 
 CHECKERS = [
+    check_schemas,
     check_anchors,
     CheckExamples,
 ]
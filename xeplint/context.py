@@ -1,8 +1,32 @@
+import functools
+
 import lxml.etree
 
 from . import messages
 
 
+SECTION_TAGS = frozenset(
+    "section{}".format(i)
+    for i in range(1, 7)
+)
+
+_INDEXED_TAGS = frozenset(["code", "example"]) | SECTION_TAGS
+
+_XSD_SCHEMA_TAG = "{http://www.w3.org/2001/XMLSchema}schema"
+
+
+# XEPs often embed the same schemas, so compiled schemas (or the errors from
+# compiling them) are cached by code block text; identical text also means
+# identical line numbers in a cached error log
+@functools.lru_cache(maxsize=256)
+def _compile_schema(text: str):
+    tree = lxml.etree.fromstring(text).getroottree()
+    try:
+        return lxml.etree.XMLSchema(tree), None
+    except lxml.etree.XMLSchemaParseError as exc:
+        return None, exc.error_log
+
+
 class XeplintContext:
     def __init__(self,
                  tree: lxml.etree.ElementTree,
@@ -11,18 +35,42 @@ class XeplintContext:
         self.tree = tree
         self.filename = filename
 
-        self.schemas = {}
+        # collect all elements the checkers are interested in with a single
+        # walk over the tree, in document order
+        self._elements = list(tree.iter(*_INDEXED_TAGS))
+
+        self._parser = lxml.etree.XMLParser(collect_ids=False)
+
         self.messages = messages.MessageStore(filename)
-        self.find_schemas()
 
-    def find_schemas(self):
-        for codeblock in self.tree.xpath("//code"):
+    def iter_elements(self, *tags):
+        for tag in tags:
+            if tag not in _INDEXED_TAGS:
+                raise ValueError("tag {!r} is not indexed".format(tag))
+
+        return (el for el in self._elements if el.tag in tags)
+
+    @functools.cached_property
+    def schemas(self):
+        # compiling schemas is expensive, so it only happens on first use
+        return self._compute_schemas()
+
+    def _compute_schemas(self):
+        schemas = {}
+
+        for codeblock in self.iter_elements("code"):
             if codeblock.text is None:
                 continue
 
-            lxml.etree.clear_error_log()
+            # most code blocks are stanzas; only schemas reference the XML
+            # Schema namespace, so skip everything else without parsing it
+            if "XMLSchema" not in codeblock.text:
+                continue
+
             try:
-                tree = lxml.etree.fromstring(codeblock.text).getroottree()
+                tree = lxml.etree.fromstring(
+                    codeblock.text, self._parser,
+                ).getroottree()
             except lxml.etree.XMLSyntaxError:
                 continue
             except ValueError as exc:
@@ -33,17 +81,15 @@ class XeplintContext:
                 )
                 continue
 
-            if tree.getroot().tag != "{http://www.w3.org/2001/XMLSchema}schema":
+            if tree.getroot().tag != _XSD_SCHEMA_TAG:
                 continue
 
-            lxml.etree.clear_error_log()
-            try:
-                schema = lxml.etree.XMLSchema(tree)
-            except lxml.etree.XMLSchemaParseError as exc:
+            schema, error_log = _compile_schema(codeblock.text)
+            if schema is None:
                 with self.messages.context(
                         line_offset=codeblock.sourceline,
                         override_filename=self.filename) as ctx:
-                    for log_entry in exc.error_log:
+                    for log_entry in error_log:
                         messages.record_error_log_entry(
                             ctx,
                             MESSAGE_TYPE_XML_SCHEMA_PARSER,
@@ -53,7 +99,7 @@ class XeplintContext:
 
             target_ns = tree.getroot().get("targetNamespace")
 
-            if target_ns in self.schemas:
+            if target_ns in schemas:
                 self.messages.record(
                     MESSAGE_TYPE_DUPLICATE_SCHEMA,
                     messages.Location(self.filename, codeblock.sourceline,
@@ -63,7 +109,9 @@ class XeplintContext:
                 )
                 continue
 
-            self.schemas[target_ns] = schema
+            schemas[target_ns] = schema
+
+        return schemas
 
 
 MESSAGE_TYPE_XML_SCHEMA_PARSER = messages.registry.register(
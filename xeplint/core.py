@@ -1,13 +1,29 @@
+import concurrent.futures
+import io
 import pathlib
+import sys
 
 import lxml.etree
 
 from . import context, checkers
 
 
-def process_file(path: pathlib.Path):
-    with path.open() as f:
-        tree = lxml.etree.parse(f)
+# the checkers do not need an ID index; entities stay enabled because they
+# read element text, which must include the substituted entity values
+_PARSER = lxml.etree.XMLParser(
+    collect_ids=False,
+    huge_tree=False,
+    remove_blank_text=False,
+)
+
+
+def process_file(path: pathlib.Path) -> str:
+    try:
+        tree = lxml.etree.parse(str(path), _PARSER)
+    except (lxml.etree.XMLSyntaxError, OSError) as exc:
+        # lxml's exceptions carry an error log which cannot be pickled back
+        # from the worker process, so only pass on the message
+        raise RuntimeError("{}: {}".format(path, exc)) from None
 
     ctx = context.XeplintContext(tree, str(path))
 
@@ -15,7 +31,9 @@ def process_file(path: pathlib.Path):
         instance = checker(ctx)
         instance.check()
 
-    ctx.messages.print()
+    buf = io.StringIO()
+    ctx.messages.print(buf)
+    return buf.getvalue()
 
 
 def main():
@@ -32,5 +50,8 @@ def main():
 
     args = parser.parse_args()
 
-    for path in args.infiles:
-        process_file(path)
+    # files are independent, so lint them in parallel; the output of each
+    # file is written in one go and in input order to avoid interleaving
+    with concurrent.futures.ProcessPoolExecutor() as executor:
+        for output in executor.map(process_file, args.infiles):
+            sys.stderr.write(output)
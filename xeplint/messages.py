@@ -2,19 +2,24 @@ import abc
 import collections
 import functools
 import enum
+import operator
 import typing
 import sys
 
 
 class MessageType(collections.namedtuple("MessageType",
                                          ["class_", "id_", "name"])):
-    def __str__(self):
+    @functools.cached_property
+    def _str(self):
         return "{}-{:04d}:{}".format(
             self.class_.value[0],
             self.id_,
             self.name,
         )
 
+    def __str__(self):
+        return self._str
+
 
 @functools.total_ordering
 class MessageLevel(enum.Enum):
@@ -23,13 +28,17 @@ class MessageLevel(enum.Enum):
     ERROR = "E", "error"
 
     def __lt__(self, other):
-        return self._order.index(self) < self._order.index(other)
+        return self._rank < other._rank
 
 
 MessageLevel._order = [MessageLevel.CONVENTION,
                        MessageLevel.WARNING,
                        MessageLevel.ERROR]
 
+for rank, level in enumerate(MessageLevel._order):
+    level._rank = rank
+del rank, level
+
 
 class MessageTypeRegistry:
     def __init__(self):
@@ -62,14 +71,15 @@ class Location(collections.namedtuple("Location", ["filename", "line", "col"])):
     def __new__(cls, filename, line=None, col=None):
         return super().__new__(cls, filename, line, col)
 
+    @functools.cached_property
+    def _sortkey(self):
+        return (self.filename or "", self.line or 0, self.col or 0)
+
     def replace(self, **kwargs):
         return super()._replace(**kwargs)
 
     def __lt__(self, other):
-        return (
-            (self.filename or "", self.line or 0, self.col or 0) <
-            (other.filename or "", other.line or 0, other.col or 0)
-        )
+        return self._sortkey < other._sortkey
 
     def __str__(self):
         parts = [self.filename]
@@ -81,13 +91,19 @@ class Location(collections.namedtuple("Location", ["filename", "line", "col"])):
 class Message(collections.namedtuple("Message",
                                      ["location", "type", "message",
                                       "args", "kwargs"])):
-    def __str__(self):
+    # formatting is deferred until the message is actually output and done at
+    # most once
+    @functools.cached_property
+    def _formatted(self):
         return "{}:{}: {}".format(
             self.location,
             self.type,
             self.message.format(*self.args, **self.kwargs),
         )
 
+    def __str__(self):
+        return self._formatted
+
 
 class MessageRecord(collections.namedtuple("MessageRecord",
                                            ["main", "related"])):
@@ -114,19 +130,20 @@ class MessageHandler(metaclass=abc.ABCMeta):
         return record
 
     def _prep_message(self, message):
-        if not message.location.filename:
-            message = message._replace(
-                location=message.location._replace(
-                    filename=self.default_filename,
-                )
-            )
+        if message.location.filename:
+            return message
 
-        return message
+        return message._replace(
+            location=message.location._replace(
+                filename=self._default_filename,
+            )
+        )
 
     def _prep_record(self, record):
+        prep_message = self._prep_message
         return MessageRecord(
-            self._prep_message(record.main),
-            [msg for msg in self._prep_message(msg)],
+            prep_message(record.main),
+            [prep_message(msg) for msg in record.related],
         )
 
     def _add_records(self, records):
@@ -140,17 +157,20 @@ class MessageStore(MessageHandler):
         self._default_filename = default_filename
 
     def _handle_record(self, record):
-        self._records.append(record)
+        self._records.append((record.main.location._sortkey, record))
 
     def context(self, **kwargs):
         return MessageContext(self._add_records, **kwargs)
 
     def print(self, outfile=sys.stderr):
-        self._records.sort(key=lambda x: x.main.location)
-        for rec in self._records:
-            print(rec.main, file=outfile)
-            for related in rec.related:
-                print(related, file=outfile)
+        self._records.sort(key=operator.itemgetter(0))
+        lines = []
+        for _, rec in self._records:
+            lines.append(str(rec.main))
+            lines.extend(map(str, rec.related))
+        if lines:
+            lines.append("")
+            outfile.write("\n".join(lines))
 
 
 class MessageContext(MessageHandler):